@@ -3,12 +3,20 @@ from textual.screen import Screen
 from textual.widgets import Header, Footer, Static, ListView, ListItem, DataTable, Label, TabbedContent, TabPane, Input, Button
 from textual.containers import Container, Horizontal, Vertical, VerticalScroll
 from textual import on, work
+from textual.message import Message
+from textual.worker import get_current_worker
 import pandas as pd
 import numpy as np
 import os
 import json
-import google.generativeai as genai
+import re
+import threading
+from typing import Optional
 from collections import Counter
+from workbook import (
+	cache_enabled, cache_file, file_digest, load_sheet_names, parse_pool,
+	read_json_cache, read_sheet, shutdown_pool, warm_parse_pool, write_json_cache,
+)
 
 # Minimalist App Theme (Tokyo Night inspired)
 CSS = """
@@ -155,8 +163,58 @@ CSS = """
 	TabPane {
 		padding: 0;
 	}
+
+	#data-table {
+		height: 1fr;
+	}
+
+	.row-range {
+		width: 100%;
+		text-align: right;
+		color: #565f89;
+		padding: 0 2;
+	}
 """
 
+# The configured Gemini model is shared across screens; configuring the
+# client is done once per API key instead of once per chart request.
+GEMINI_MODEL = "gemini-1.5-flash"
+# Bump when the chart prompt changes, so cached AI suggestions are regenerated
+AI_PROMPT_VERSION = 2
+_MODEL = None
+_MODEL_KEY = None
+_MODEL_LOCK = threading.Lock()
+
+# The suggestions JSON array inside a response, with or without markdown fences around it
+_JSON_ARRAY_RE = re.compile(r"\[[\s\S]*\]")
+
+
+def gemini_model(api_key: str):
+	"""Return the shared GenerativeModel, configuring it on first use."""
+	global _MODEL, _MODEL_KEY
+	with _MODEL_LOCK:
+		if _MODEL is None or _MODEL_KEY != api_key:
+			# Imported here: it is slow to import and only needed once AI charts are requested
+			import google.generativeai as genai
+			genai.configure(api_key=api_key)
+			_MODEL = genai.GenerativeModel(GEMINI_MODEL)
+			_MODEL_KEY = api_key
+		return _MODEL
+
+
+def ai_cache_path(file_path: str, sheet_name: str) -> Optional[str]:
+	"""Cache entry for a sheet's AI chart suggestions, or None when caching is off.
+
+	Keyed on the workbook's contents, the sheet, the model and the prompt version.
+	The prompt text itself is left out: the preview's dtypes, and so the prompt,
+	differ depending on whether the sheet came from the cache or a fresh parse.
+	"""
+	if not cache_enabled():
+		return None
+	key = f"{sheet_name}\n{GEMINI_MODEL}\nprompt-v{AI_PROMPT_VERSION}"
+	return cache_file(file_digest(file_path), key, "json", subdir="ai")
+
+
 class BarChart(Static):
 	"""A simple ASCII bar chart widget."""
 
@@ -170,14 +228,55 @@ class BarChart(Static):
 			return "No data to display"
 
 		max_value = max(self.data.values()) if self.data.values() else 1
-		lines = []
-
-		for label, value in self.data.items():
-			bar_length = int((value / max_value) * self.max_bar_length) if max_value > 0 else 0
-			bar = "█" * bar_length
-			lines.append(f"{label:15} │ {bar} {value}")
-
-		return "\n".join(lines)
+		# Each bar is a slice of one full-length bar; with no positive max, all bars are empty
+		full_bar = "█" * self.max_bar_length
+		divisor = max_value if max_value > 0 else float("inf")
+
+		return "\n".join([
+			f"{label:15} │ {full_bar[:max(0, int((value / divisor) * self.max_bar_length))]} {value}"
+			for label, value in self.data.items()
+		])
+
+
+def format_stats(df: pd.DataFrame) -> str:
+	"""Statistics text for `df`, as shown by StatsPanel. Plain pandas, so it is safe off the UI thread."""
+	lines = []
+	lines.append("📊 [bold cyan]Dataset Statistics[/bold cyan]\n")
+	lines.append(f"Rows: [green]{len(df)}[/green]")
+	lines.append(f"Columns: [green]{len(df.columns)}[/green]\n")
+
+	# Numeric columns statistics
+	numeric_cols = df.select_dtypes(include=[np.number]).columns
+	if len(numeric_cols) > 0:
+		lines.append("[bold cyan]Numeric Columns:[/bold cyan]")
+		cols = list(numeric_cols[:5])  # Show first 5 numeric columns
+		funcs = ["min", "max", "mean", "std"]
+		# One aggregation pass over all of them; if that fails, go column by
+		# column so one bad column only loses its own figures
+		try:
+			stats = df[cols].agg(funcs)
+		except Exception:
+			stats = None
+		for col in cols:
+			try:
+				figures = stats[col] if stats is not None else df[col].agg(funcs)
+				lines.append(f"\n[yellow]{col}[/yellow]")
+				lines.append(f"  Min:  {figures['min']:.2f}")
+				lines.append(f"  Max:  {figures['max']:.2f}")
+				lines.append(f"  Mean: {figures['mean']:.2f}")
+				lines.append(f"  Std:  {figures['std']:.2f}")
+			except:
+				pass
+
+	# Categorical columns
+	cat_cols = df.select_dtypes(include=['object', 'category']).columns
+	if len(cat_cols) > 0:
+		lines.append(f"\n[bold cyan]Text Columns:[/bold cyan] {len(cat_cols)}")
+		unique_counts = df[list(cat_cols[:3])].nunique()  # Show first 3 categorical columns
+		for col, unique_count in unique_counts.items():
+			lines.append(f"  {col}: {unique_count} unique values")
+
+	return "\n".join(lines)
 
 
 class StatsPanel(Static):
@@ -188,34 +287,7 @@ class StatsPanel(Static):
 		self.df = df
 
 	def render(self) -> str:
-		lines = []
-		lines.append("📊 [bold cyan]Dataset Statistics[/bold cyan]\n")
-		lines.append(f"Rows: [green]{len(self.df)}[/green]")
-		lines.append(f"Columns: [green]{len(self.df.columns)}[/green]\n")
-
-		# Numeric columns statistics
-		numeric_cols = self.df.select_dtypes(include=[np.number]).columns
-		if len(numeric_cols) > 0:
-			lines.append("[bold cyan]Numeric Columns:[/bold cyan]")
-			for col in numeric_cols[:5]:  # Show first 5 numeric columns
-				try:
-					lines.append(f"\n[yellow]{col}[/yellow]")
-					lines.append(f"  Min:  {self.df[col].min():.2f}")
-					lines.append(f"  Max:  {self.df[col].max():.2f}")
-					lines.append(f"  Mean: {self.df[col].mean():.2f}")
-					lines.append(f"  Std:  {self.df[col].std():.2f}")
-				except:
-					pass
-
-		# Categorical columns
-		cat_cols = self.df.select_dtypes(include=['object']).columns
-		if len(cat_cols) > 0:
-			lines.append(f"\n[bold cyan]Text Columns:[/bold cyan] {len(cat_cols)}")
-			for col in cat_cols[:3]:  # Show first 3 categorical columns
-				unique_count = self.df[col].nunique()
-				lines.append(f"  {col}: {unique_count} unique values")
-
-		return "\n".join(lines)
+		return format_stats(self.df)
 
 
 class CategoryChart(Static):
@@ -233,21 +305,162 @@ class CategoryChart(Static):
 
 		value_counts = self.df[self.column].value_counts().head(self.top_n)
 
-		lines = []
-		lines.append(f"[bold cyan]Top {self.top_n} - {self.column}[/bold cyan]\n")
-
 		max_value = value_counts.max() if len(value_counts) > 0 else 1
 		max_bar_length = 30
+		full_bar = "█" * max_bar_length
+		divisor = max_value if max_value > 0 else float("inf")
 
-		for label, count in value_counts.items():
-			bar_length = int((count / max_value) * max_bar_length) if max_value > 0 else 0
-			bar = "█" * bar_length
-			label_str = str(label)[:20]  # Truncate long labels
-			lines.append(f"{label_str:20} │ {bar} {count}")
+		lines = [f"[bold cyan]Top {self.top_n} - {self.column}[/bold cyan]\n"]
+		# Labels are truncated to 20 characters
+		lines += [
+			f"{str(label)[:20]:20} │ {full_bar[:int((count / divisor) * max_bar_length)]} {count}"
+			for label, count in value_counts.items()
+		]
 
 		return "\n".join(lines)
 
 
+class VirtualExcelTable(DataTable):
+	"""A DataTable that only materializes a sliding window of a DataFrame's rows.
+
+	The full DataFrame stays in memory; the rows around the cursor (or, when
+	scrolling with the mouse, around the viewport) are converted and added to
+	the table, and the window is shifted as they near its edges.
+	"""
+
+	class WindowMoved(Message):
+		"""Posted when a different range of sheet rows is loaded.
+
+		`total_rows` is None while the table holds only the first rows of the sheet.
+		"""
+
+		def __init__(self, first_row: int, end_row: int, total_rows: Optional[int]) -> None:
+			super().__init__()
+			self.first_row = first_row
+			self.end_row = end_row
+			self.total_rows = total_rows
+
+	def __init__(self, window_size: int = 300, **kwargs):
+		super().__init__(**kwargs)
+		self.window_size = window_size
+		self.df = None
+		self.partial = False
+		self.window_start = 0
+		# Set while the window is being replaced; the scroll changes that causes
+		# are not the user scrolling
+		self._repositioning = False
+
+	def load(self, df: pd.DataFrame, partial: bool = False):
+		"""Show `df`, keeping the cursor on the same sheet row if there is one.
+
+		`partial` marks `df` as only the first rows of the sheet, so no total is reported.
+		"""
+		sheet_row = self.window_start + self.cursor_row
+		column = self.cursor_column
+		self.df = df
+		self.partial = partial
+		self.window_start = 0
+		self.clear(columns=True)
+		self.add_columns(*[str(col) for col in df.columns])
+		self._fill_window()
+		if 0 < sheet_row < len(df):
+			self._move_window(sheet_row)
+			self.move_cursor(column=column, animate=False)
+
+	def _fill_window(self):
+		chunk = self.df.iloc[self.window_start:self.window_start + self.window_size]
+		# Fill NaNs, then convert to str in one vectorized pass. The object step matters:
+		# with dtype=str an all-float frame is cast before na_value applies and shows "nan".
+		# Cells can't be left for DataTable to stringify lazily: it formats every added
+		# cell to size the columns, and would round floats to 2 decimals.
+		cells = chunk.to_numpy(dtype=object, na_value="").astype(str)
+		# Rows go from the array to the table one at a time, without a nested list copy
+		for sheet_row, row in enumerate(cells, start=self.window_start + 1):
+			# Label rows with their position in the sheet, not in the window
+			self.add_row(*row.tolist(), label=str(sheet_row))
+		total = None if self.partial else len(self.df)
+		self.post_message(self.WindowMoved(self.window_start, self.window_start + len(cells), total))
+
+	def _window_start_for(self, sheet_row: int) -> int:
+		"""Start of a window centered on `sheet_row`, clamped to the sheet."""
+		return max(0, min(sheet_row - self.window_size // 2, len(self.df) - self.window_size))
+
+	def _set_window(self, start: int):
+		self.window_start = start
+		self._repositioning = True
+		self.clear()
+		self._fill_window()
+		# Queued after the cursor/scroll updates that follow the refill
+		self.call_after_refresh(self._end_repositioning)
+
+	def _end_repositioning(self):
+		self._repositioning = False
+
+	def _near_edge(self, first: int, last: int) -> bool:
+		"""Whether loaded rows `first`..`last` are close to an edge that has more rows past it."""
+		margin = self.window_size // 6
+		near_bottom = last >= self.row_count - margin and self.window_start + self.row_count < len(self.df)
+		near_top = first < margin and self.window_start > 0
+		return near_bottom or near_top
+
+	def _move_window(self, sheet_row: int):
+		"""Re-center the window on `sheet_row` and put the cursor on it."""
+		start = self._window_start_for(sheet_row)
+		column = self.cursor_column
+		if start != self.window_start:
+			self._set_window(start)
+		self.move_cursor(row=sheet_row - start, column=column, animate=False)
+
+	def _slide_viewport(self):
+		"""Re-center the window on the visible rows, keeping the view where it is."""
+		if self.df is None or self._repositioning:
+			return
+		top = int(self.scroll_y)
+		height = self.scrollable_content_region.height
+		# A visible cursor already slides the window as it moves
+		if top <= self.cursor_row < top + height:
+			return
+		if not self._near_edge(top, top + height):
+			return
+		sheet_top = self.window_start + top
+		sheet_cursor = self.window_start + self.cursor_row
+		column = self.cursor_column
+		self._set_window(self._window_start_for(sheet_top))
+
+		# Keep the cursor on its row unless that is now off or at the edge of the
+		# window; then it follows the view, so cursor-driven sliding doesn't undo this
+		cursor = sheet_cursor - self.window_start
+		if not 0 <= cursor < self.row_count or self._near_edge(cursor, cursor):
+			cursor = sheet_top - self.window_start
+		self.move_cursor(row=cursor, column=column, scroll=False)
+		self.scroll_to(y=sheet_top - self.window_start, animate=False)
+
+	def watch_scroll_y(self, old_value: float, new_value: float) -> None:
+		super().watch_scroll_y(old_value, new_value)
+		# Mouse wheel and scrollbar scrolling move the view without moving the cursor
+		if self.df is not None and not self._repositioning and round(old_value) != round(new_value):
+			self.call_after_refresh(self._slide_viewport)
+
+	@on(DataTable.CellHighlighted)
+	@on(DataTable.RowHighlighted)
+	def _slide_window(self):
+		if self.df is None:
+			return
+		row = self.cursor_row
+		if self._near_edge(row, row):
+			self._move_window(self.window_start + row)
+
+	def action_scroll_top(self):
+		if self.df is not None and self.window_start > 0:
+			self._move_window(0)
+		super().action_scroll_top()
+
+	def action_scroll_bottom(self):
+		if self.df is not None and self.window_start + self.row_count < len(self.df):
+			self._move_window(len(self.df) - 1)
+		super().action_scroll_bottom()
+
+
 class SelectionListItem(ListItem):
 	"""A custom ListItem that keeps track of the value it represents."""
 	def __init__(self, label_text: str) -> None:
@@ -273,42 +486,68 @@ class ApiKeyScreen(Screen):
 		key = self.query_one("#api-key-input").value
 		if key:
 			os.environ["GOOGLE_API_KEY"] = key
+			self.app.prepare_ai_model(key)
 			self.app.pop_screen()
 			self.app.push_screen(FileSelectionScreen())
 
 class FileSelectionScreen(Screen):
 	"""Screen to select an Excel file from the ./xlsx directory."""
 
+	folder = "xlsx"
+
 	def compose(self) -> ComposeResult:
-		folder = "xlsx"
-		if not os.path.exists(folder):
-			os.makedirs(folder)
+		with Container(classes="menu-container", id="file-menu"):
+			yield Label("📁 Select File", classes="title")
+			yield ListView(id="file-list")
+			yield Label("Looking for Excel files...", id="loading-msg", classes="instruction")
 
-		files = sorted([f for f in os.listdir(folder) if f.endswith(".xlsx") or f.endswith(".xls")])
-		self.files = files
+		yield Footer()
 
-		with Container(classes="menu-container"):
-			yield Label("📁 Select File", classes="title")
+	def on_mount(self):
+		self.scan_files()
 
-			if not files:
-				yield Label("No Excel files found!", classes="message")
-				yield Label(f"Please place your .xlsx files in the '{folder}' folder.", classes="instruction")
-				yield Label("Press Ctrl+C to exit.", classes="instruction")
-			else:
-				yield ListView(
-					*[SelectionListItem(f) for f in files],
-					id="file-list"
-				)
-				yield Label("▲/▼ to Navigate • Enter to Select", classes="instruction")
+	@work(thread=True)
+	def scan_files(self):
+		folder = self.folder
+		os.makedirs(folder, exist_ok=True)
+
+		# Reuse the last listing while the folder is unchanged
+		mtime = os.stat(folder).st_mtime_ns
+		cached = self.app.file_cache
+		if cached is not None and cached[0] == mtime:
+			files = cached[1]
+		else:
+			with os.scandir(folder) as entries:
+				files = sorted(e.name for e in entries if e.name.endswith((".xlsx", ".xls")) and e.is_file())
+			self.app.file_cache = (mtime, files)
 
-		yield Footer()
+		self.app.call_from_thread(self.update_list, files)
+
+	async def update_list(self, files):
+		self.files = files
+		self.query_one("#loading-msg").remove()
+		container = self.query_one("#file-menu", Container)
+		list_view = self.query_one("#file-list", ListView)
+
+		if not files:
+			list_view.remove()
+			container.mount(
+				Label("No Excel files found!", classes="message"),
+				Label(f"Please place your .xlsx files in the '{self.folder}' folder.", classes="instruction"),
+				Label("Press Ctrl+C to exit.", classes="instruction"),
+			)
+		else:
+			await list_view.extend(SelectionListItem(f) for f in files)
+			list_view.index = 0
+			container.mount(Label("▲/▼ to Navigate • Enter to Select", classes="instruction"))
+			list_view.focus()
 
 	@on(ListView.Selected)
 	def select_file(self, event: ListView.Selected):
 		# Access the custom attribute directly from our custom ListItem
 		if isinstance(event.item, SelectionListItem):
 			selected_file = event.item.label_text
-			file_path = os.path.join("xlsx", selected_file)
+			file_path = os.path.join(self.folder, selected_file)
 			self.app.push_screen(SheetSelectionScreen(file_path))
 
 
@@ -332,8 +571,7 @@ class SheetSelectionScreen(Screen):
 	@work(thread=True)
 	def load_sheets(self):
 		try:
-			xl = pd.ExcelFile(self.file_path)
-			sheets = xl.sheet_names
+			sheets = parse_pool().submit(load_sheet_names, self.file_path).result()
 			# Sort sheets? Optional, but often safe to keep original order for Excel.
 
 			self.app.call_from_thread(self.update_list, sheets)
@@ -366,16 +604,23 @@ class SheetSelectionScreen(Screen):
 class DataViewerScreen(Screen):
 	"""Screen to view the Excel data with statistics and visualizations."""
 
+	# Rows read up front so the first rows and the AI prompt don't wait for the full sheet
+	PREVIEW_ROWS = 200
+
 	def __init__(self, file_path: str, sheet_name: str):
 		super().__init__()
 		self.file_path = file_path
 		self.sheet_name = sheet_name
 		self.df = None
+		self.df_preview = None
+		self.pending_suggestions = None
+		self.parse_futures = []
 
 	def compose(self) -> ComposeResult:
 		with TabbedContent():
 			with TabPane("📋 Data", id="data-tab"):
-				yield DataTable(id="data-table")
+				yield VirtualExcelTable(id="data-table")
+				yield Label(id="row-range", classes="row-range")
 
 			with TabPane("📊 Statistics", id="stats-tab"):
 				with VerticalScroll(classes="stats-container"):
@@ -391,43 +636,90 @@ class DataViewerScreen(Screen):
 		self.title = f"{os.path.basename(self.file_path)} - {self.sheet_name}"
 		self.load_data()
 
+	def on_unmount(self):
+		# Parses that haven't started yet would hold up the next sheet's
+		for future in self.parse_futures:
+			future.cancel()
+
 	@work(thread=True)
 	def load_data(self):
+		# Cancelled when the screen is closed; nothing after that point is shown
+		worker = get_current_worker()
 		try:
-			self.df = pd.read_excel(self.file_path, sheet_name=self.sheet_name)
-
-			# Prepare data for display
-			df_display = self.df.fillna("")
-			columns = [str(col) for col in df_display.columns]
-			rows = df_display.values.tolist()
-			rows = [[str(cell) for cell in row] for row in rows]
-
-			self.app.call_from_thread(self.populate_ui, columns, rows)
+			# The preview and the full sheet are parsed in parallel worker processes
+			pool = parse_pool()
+			full = pool.submit(read_sheet, self.file_path, self.sheet_name)
+			preview = pool.submit(read_sheet, self.file_path, self.sheet_name, self.PREVIEW_ROWS)
+			self.parse_futures = [full, preview]
+
+			self.df_preview = preview.result()
+			if worker.is_cancelled:
+				return
+			self.app.call_from_thread(self.populate_preview)
+
+			self.df = full.result()
+			if worker.is_cancelled:
+				return
+			# Statistics are computed here, overlapping the AI request instead of blocking the UI
+			stats = format_stats(self.df)
+			if worker.is_cancelled:
+				return
+			self.app.call_from_thread(self.populate_ui, stats)
 		except Exception as e:
-			self.app.call_from_thread(self.show_error, str(e))
+			if not worker.is_cancelled:
+				self.app.call_from_thread(self.show_load_error, str(e))
 
-	def populate_ui(self, columns, rows):
-		# Populate data table
-		table = self.query_one("#data-table", DataTable)
-		table.add_columns(*columns)
-		table.add_rows(rows)
+	def populate_preview(self):
+		"""Show the first rows and start the AI charts while the full sheet loads."""
+		# Start the network-bound AI request first so it overlaps with everything else
+		self.populate_charts()
+
+		self.query_one("#stats-panel", Static).update("Loading statistics...")
+		table = self.query_one("#data-table", VirtualExcelTable)
+		table.load(self.df_preview, partial=True)
 		table.focus()
 
+	def populate_ui(self, stats):
 		# Populate statistics
-		self.populate_statistics()
+		self.populate_statistics(stats)
 
-		# Populate charts
-		self.populate_charts()
+		# Populate data table; only the rows around the cursor are materialized
+		table = self.query_one("#data-table", VirtualExcelTable)
+		table.load(self.df)
+		table.focus()
+
+		# Charts were suggested from the preview; draw them now that the full data is here
+		if self.pending_suggestions is not None:
+			self.render_ai_charts(self.pending_suggestions)
+			self.pending_suggestions = None
+
+	@on(VirtualExcelTable.WindowMoved)
+	def update_row_range(self, event: VirtualExcelTable.WindowMoved):
+		"""Tell the user which part of the sheet is loaded, since the table only holds a window."""
+		label = self.query_one("#row-range", Label)
+		if event.total_rows is None:
+			label.update(f"First {event.end_row:,} rows (loading…)")
+		elif event.end_row - event.first_row >= event.total_rows:
+			label.update(f"{event.total_rows:,} rows")
+		else:
+			label.update(f"Rows {event.first_row + 1:,}–{event.end_row:,} of {event.total_rows:,}")
 
-	def populate_statistics(self):
-		"""Populate the statistics panel."""
-		stats_panel = self.query_one("#stats-panel", Static)
-		stats_widget = StatsPanel(self.df)
-		stats_panel.update(stats_widget.render())
+	def populate_statistics(self, stats):
+		"""Populate the statistics panel with text from format_stats."""
+		self.query_one("#stats-panel", Static).update(stats)
 
 	def populate_charts(self):
 		"""Populate the charts panel."""
 		charts_panel = self.query_one("#charts-panel", Static)
+
+		# Don't spend an AI request on sheets that have nothing to chart
+		df = self.df_preview
+		numeric_count = df.select_dtypes(include=[np.number]).shape[1]
+		text_count = df.select_dtypes(include=['object', 'category']).shape[1]
+		if numeric_count + text_count == 0 or len(df) < 5:
+			charts_panel.update("Not enough data to generate charts.")
+			return
+
 		charts_panel.update("🤖 Asking AI for visualization suggestions...\n(This might take a few seconds)")
 		self.generate_ai_charts()
 
@@ -439,21 +731,24 @@ class DataViewerScreen(Screen):
 			return
 
 		try:
-			genai.configure(api_key=api_key)
-			model = genai.GenerativeModel('gemini-1.5-flash')
-
-			# Prepare summary
-			buffer = []
-			buffer.append("Columns: " + ", ".join([str(c) for c in self.df.columns]))
-
-			# Sample data (first 5 rows)
-			sample_data = self.df.head(5).to_string()
-			buffer.append(f"Sample data:\n{sample_data}")
-
-			summary = "\n".join(buffer)
+			# Prepare a compact JSON summary: column dtypes, min/max/mean of numeric columns
+			# (rounded, NaNs dropped), distinct counts of text columns and 3 sample rows
+			# (in column order, blanks for missing values)
+			df = self.df_preview
+			numeric_stats = df.select_dtypes(include=[np.number]).agg(["min", "max", "mean"])
+			text_cols = df.select_dtypes(include=['object', 'category'])
+			summary = json.dumps({
+				"dtypes": {str(c): str(t) for c, t in df.dtypes.items()},
+				"numeric": {
+					str(col): {stat: round(float(value), 2) for stat, value in figures.items() if pd.notna(value)}
+					for col, figures in numeric_stats.items()
+				},
+				"distinct": {str(c): int(n) for c, n in text_cols.nunique().items()},
+				"sample": df.head(3).to_numpy(dtype=object, na_value="").astype(str).tolist(),
+			}, separators=(",", ":"))
 
 			prompt = f"""
-			Analyze this dataset summary:
+			Analyze this dataset summary (JSON):
 			{summary}
 
 			Suggest 3 visualizations to understand this data.
@@ -469,22 +764,33 @@ class DataViewerScreen(Screen):
 			For 'histogram', use a numeric column.
 			"""
 
-			response = model.generate_content(prompt)
-			text = response.text.strip()
-			# Remove markdown code blocks if present
-			if text.startswith("```json"):
-				text = text[7:]
-			if text.startswith("```"):
-				text = text[3:]
-			if text.endswith("```"):
-				text = text[:-3]
+			# Cached suggestions skip the API round-trip
+			cached = ai_cache_path(self.file_path, self.sheet_name)
 
-			suggestions = json.loads(text)
-			self.app.call_from_thread(self.render_ai_charts, suggestions)
+			if cached and os.path.exists(cached):
+				suggestions = read_json_cache(cached)
+			else:
+				response = gemini_model(api_key).generate_content(prompt)
+				match = _JSON_ARRAY_RE.search(response.text)
+				if match is None:
+					raise ValueError("No JSON array in the AI response")
+
+				suggestions = json.loads(match.group(0))
+				if cached:
+					write_json_cache(cached, suggestions)
+
+			self.app.call_from_thread(self.show_ai_charts, suggestions)
 
 		except Exception as e:
 			self.app.call_from_thread(self.show_error, f"AI Error: {str(e)}")
 
+	def show_ai_charts(self, suggestions):
+		"""Render the suggestions, or hold them until the full sheet has loaded."""
+		if self.df is None:
+			self.pending_suggestions = suggestions
+		else:
+			self.render_ai_charts(suggestions)
+
 	def render_ai_charts(self, suggestions):
 		charts_panel = self.query_one("#charts-panel", Static)
 		lines = []
@@ -501,8 +807,8 @@ class DataViewerScreen(Screen):
 					x_col = item.get("x_column")
 					y_col = item.get("y_column")
 					if x_col in self.df.columns and y_col in self.df.columns:
-						# Group by x and sum y
-						data = self.df.groupby(x_col)[y_col].sum().head(10).to_dict()
+						# Group by x and sum y, keeping the 10 largest groups (partial sort, no full sort of the keys)
+						data = self.df.groupby(x_col, sort=False, observed=True)[y_col].sum().nlargest(10).to_dict()
 						chart = BarChart(data)
 						lines.append(chart.render())
 					else:
@@ -520,8 +826,11 @@ class DataViewerScreen(Screen):
 					col = item.get("column")
 					if col in self.df.columns:
 						try:
-							hist, bins = np.histogram(self.df[col].dropna(), bins=10)
-							max_hist = max(hist) if len(hist) > 0 else 1
+							# Only copy the column when there are NaNs to drop
+							series = self.df[col]
+							values = series.dropna().to_numpy() if series.hasnans else series.to_numpy()
+							hist, bins = np.histogram(values, bins=10)
+							max_hist = hist.max() if len(hist) > 0 else 1
 							for i, count in enumerate(hist):
 								bar_length = int((count / max_hist) * 30) if max_hist > 0 else 0
 								bar = "█" * bar_length
@@ -539,6 +848,12 @@ class DataViewerScreen(Screen):
 
 		charts_panel.update("\n".join(lines))
 
+	def show_load_error(self, error):
+		"""Drop the "loading" row note when the full sheet is not coming."""
+		if self.df is None:
+			self.query_one("#row-range", Label).update(f"Could not load the full sheet: {error}")
+		self.show_error(error)
+
 	def show_error(self, error):
 		# Show error in a label or modal
 		pass
@@ -553,12 +868,29 @@ class ExcelViewerApp(App):
 		("shift+tab", "previous_tab", "Previous Tab")
 	]
 
+	# (folder mtime, file names) from the last FileSelectionScreen scan
+	file_cache = None
+
+	def run(self, *args, **kwargs):
+		try:
+			return super().run(*args, **kwargs)
+		finally:
+			shutdown_pool()
+
 	def on_mount(self):
+		# Spawn the parse workers while the user is still picking a file
+		warm_parse_pool()
 		if not os.environ.get("GOOGLE_API_KEY"):
 			self.push_screen(ApiKeyScreen())
 		else:
+			self.prepare_ai_model(os.environ["GOOGLE_API_KEY"])
 			self.push_screen(FileSelectionScreen())
 
+	@work(thread=True, exit_on_error=False)
+	def prepare_ai_model(self, api_key: str):
+		"""Set up the Gemini client while the user is still picking a file."""
+		gemini_model(api_key)
+
 	def action_pop_screen(self):
 		if len(self.screen_stack) > 1:
 			self.pop_screen()
@@ -1,15 +1,24 @@
-
 import pandas as pd
 import os
+import sys
 import numpy as np
 
+try:
+    import python_calamine  # noqa: F401
+    engine = "calamine"
+except ImportError:
+    engine = None
+
 file_path = "xlsx/HR.xlsx"
 if not os.path.exists(file_path):
     print(f"File not found: {file_path}")
     exit(1)
 
+# The first 100 rows are enough to inspect columns and dtypes; pass --full to read everything
+nrows = None if "--full" in sys.argv[1:] else 100
+
 try:
-    df = pd.read_excel(file_path)
+    df = pd.read_excel(file_path, nrows=nrows, engine=engine)
     print("Columns:", df.columns.tolist())
     print("Head:\n", df.head())
 
@@ -0,0 +1,217 @@
+# Workbook loading for app.py: reading sheets through the on-disk cache, and
+# the process pool the parsing runs in. Kept apart from the UI so that parse
+# workers only need pandas.
+
+import os
+import sys
+import json
+import hashlib
+import multiprocessing
+import threading
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker
+from functools import lru_cache
+from typing import Optional
+
+import pandas as pd
+
+# calamine (Rust) parses workbooks much faster than openpyxl; fall back to
+# pandas' default engines when it is not installed.
+try:
+	from python_calamine import CalamineWorkbook
+	EXCEL_ENGINE = "calamine"
+except ImportError:
+	CalamineWorkbook = None
+	EXCEL_ENGINE = None
+
+# On-disk cache for parsed workbooks. Set EXCEL_VIEWER_NO_CACHE=1 to bypass it.
+# Sheets are stored as pickles, and unpickling can run code, so the cache lives in
+# the user's own cache directory rather than next to wherever the app is started.
+CACHE_DIR = os.path.join(
+	os.environ.get("XDG_CACHE_HOME") or os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache"),
+	"excel-viewer",
+)
+CACHE_VERSION = 2
+
+
+def cache_enabled() -> bool:
+	return not os.environ.get("EXCEL_VIEWER_NO_CACHE")
+
+
+@lru_cache(maxsize=32)
+def _file_digest(path: str, mtime_ns: int, size: int) -> str:
+	digest = hashlib.sha1()
+	with open(path, "rb") as f:
+		for chunk in iter(lambda: f.read(1 << 20), b""):
+			digest.update(chunk)
+	return digest.hexdigest()
+
+
+def file_digest(path: str) -> str:
+	"""SHA-1 of the file contents, memoized on (path, mtime, size)."""
+	st = os.stat(path)
+	return _file_digest(path, st.st_mtime_ns, st.st_size)
+
+
+def cache_file(file_hash: str, name: str, ext: str, subdir: str = "") -> str:
+	"""Path of a cache entry for `name` inside the workbook identified by `file_hash`."""
+	folder = os.path.join(CACHE_DIR, subdir)
+	# Private to the user, so other accounts can't plant entries
+	os.makedirs(folder, mode=0o700, exist_ok=True)
+	# Sheet names may contain characters that are not valid in file names
+	name_hash = hashlib.sha1(name.encode("utf-8")).hexdigest()[:16]
+	return os.path.join(folder, f"v{CACHE_VERSION}_{file_hash}_{name_hash}.{ext}")
+
+
+def _replace_atomic(path: str, write) -> None:
+	"""Write via a temp file so an interrupted write never leaves a corrupt entry."""
+	tmp_path = f"{path}.{os.getpid()}.tmp"
+	try:
+		write(tmp_path)
+		os.replace(tmp_path, path)
+	except Exception:
+		if os.path.exists(tmp_path):
+			os.remove(tmp_path)
+
+
+def read_json_cache(path: str):
+	with open(path, encoding="utf-8") as f:
+		return json.load(f)
+
+
+def write_json_cache(path: str, data) -> None:
+	def write(tmp_path):
+		with open(tmp_path, "w", encoding="utf-8") as f:
+			json.dump(data, f)
+	_replace_atomic(path, write)
+
+
+def load_sheet_names(path: str) -> list:
+	"""List the sheets of a workbook, using the on-disk cache when possible."""
+	cached = cache_file(file_digest(path), "__sheets__", "json") if cache_enabled() else None
+	if cached and os.path.exists(cached):
+		return read_json_cache(cached)
+
+	# Only the workbook index is read, never the sheet contents
+	if CalamineWorkbook is not None:
+		sheets = CalamineWorkbook.from_path(path).sheet_names
+	elif path.lower().endswith(".xls"):
+		import xlrd
+		book = xlrd.open_workbook(path, on_demand=True)
+		sheets = book.sheet_names()
+		book.release_resources()
+	else:
+		from openpyxl import load_workbook
+		workbook = load_workbook(path, read_only=True, keep_links=False)
+		sheets = workbook.sheetnames
+		workbook.close()
+
+	if cached:
+		write_json_cache(cached, sheets)
+	return sheets
+
+
+def shrink_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+	"""Narrow column dtypes in place so reductions scan less memory.
+
+	Integer columns are downcast to the smallest integer type that fits, and
+	text columns where at most half the values are distinct become categoricals.
+	Floats are left alone: float32 would change the values shown in the table.
+	"""
+	for col in df.select_dtypes(include=["integer"]).columns:
+		df[col] = pd.to_numeric(df[col], downcast="integer")
+	for col in df.select_dtypes(include=["object"]).columns:
+		if df[col].nunique() <= len(df) * 0.5:
+			df[col] = df[col].astype("category")
+	return df
+
+
+# Each parse worker keeps its most recently used workbook open, so reading another
+# sheet of the same file reuses the already parsed archive and shared strings.
+_WORKBOOK = None
+
+
+def open_workbook(path: str) -> pd.ExcelFile:
+	"""Return an ExcelFile for `path`, reusing this process's last one if the file is unchanged."""
+	global _WORKBOOK
+	st = os.stat(path)
+	key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+	if _WORKBOOK is not None:
+		if _WORKBOOK[0] == key:
+			return _WORKBOOK[1]
+		_WORKBOOK[1].close()
+	_WORKBOOK = (key, pd.ExcelFile(path, engine=EXCEL_ENGINE))
+	return _WORKBOOK[1]
+
+
+def read_sheet(path: str, sheet_name: str, nrows: Optional[int] = None) -> pd.DataFrame:
+	"""Read one sheet (or only its first `nrows` rows) into a DataFrame.
+
+	Full reads go through the on-disk cache; partial reads are served from it
+	when the full sheet is already cached, but never written to it.
+	"""
+	cached = cache_file(file_digest(path), sheet_name, "pkl") if cache_enabled() else None
+	if cached and os.path.exists(cached):
+		try:
+			df = pd.read_pickle(cached)
+			return df if nrows is None else df.head(nrows)
+		except Exception:
+			pass  # Unreadable entry, fall through and re-parse
+
+	df = shrink_dtypes(pd.read_excel(open_workbook(path), sheet_name=sheet_name, nrows=nrows))
+	if cached and nrows is None:
+		_replace_atomic(cached, df.to_pickle)
+	return df
+
+
+# Excel parsing is CPU-bound Python that holds the GIL, so it runs in worker
+# processes instead of threads to keep the UI responsive while loading.
+PARSE_WORKERS = 2
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+
+def _init_worker() -> None:
+	"""Keep parse workers from writing to the terminal the TUI is drawn on."""
+	warnings.simplefilter("ignore")
+	devnull = os.open(os.devnull, os.O_WRONLY)
+	os.dup2(devnull, 1)
+	os.dup2(devnull, 2)
+	os.close(devnull)
+
+
+def parse_pool() -> ProcessPoolExecutor:
+	"""Process pool for workbook parsing, created on first use."""
+	global _POOL
+	with _POOL_LOCK:
+		if _POOL is None:
+			# The resource tracker is started with our stderr's file descriptor, and
+			# Textual's stderr replacement has none; hand it the real one
+			stderr, sys.stderr = sys.stderr, sys.__stderr__
+			try:
+				resource_tracker.ensure_running()
+			finally:
+				sys.stderr = stderr
+			# spawn: forking a process that is running Textual's threads is unsafe
+			_POOL = ProcessPoolExecutor(
+				max_workers=PARSE_WORKERS,
+				mp_context=multiprocessing.get_context("spawn"),
+				initializer=_init_worker,
+			)
+		return _POOL
+
+
+def warm_parse_pool() -> None:
+	"""Start every parse worker now, so the first sheet doesn't wait on interpreter startup."""
+	pool = parse_pool()
+	for _ in range(PARSE_WORKERS):
+		pool.submit(int)
+
+
+def shutdown_pool() -> None:
+	global _POOL
+	with _POOL_LOCK:
+		if _POOL is not None:
+			_POOL.shutdown(wait=False, cancel_futures=True)
+			_POOL = None